@@ -1,14 +1,52 @@
 from abc import ABC, abstractmethod
+from collections import Counter, deque
 from contextlib import asynccontextmanager
 from typing import List, Literal, Optional, Dict, Any
-import asyncio
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field
 
 from app.llm import LLM
 from app.logger import logger
 from app.schema import AgentState, Memory, Message
 from app.config import config
+from app.ws_batcher import send_event
+
+
+_STUCK_PREFIX = (
+    "Observed duplicate responses. Consider new strategies and avoid "
+    "repeating ineffective paths already attempted."
+)
+
+# Role -> Message factory, built once instead of per update_memory call
+_MESSAGE_MAP = {
+    "user": Message.user_message,
+    "system": Message.system_message,
+    "assistant": Message.assistant_message,
+    "tool": Message.tool_message,
+}
+
+_U64 = (1 << 64) - 1
+# Fingerprints within this Hamming distance count as near-duplicates
+_SIMHASH_NEAR_BITS = 3
+
+
+def _simhash(text: str) -> int:
+    """Compute a 64-bit SimHash fingerprint over whitespace tokens.
+
+    Near-identical texts produce fingerprints differing in only a few
+    bits, so similarity reduces to a Hamming-distance check.
+    """
+    weights = [0] * 64
+    for token in text.split():
+        h = hash(token) & _U64
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
 
 
 class BaseAgent(BaseModel, ABC):
@@ -45,22 +83,39 @@ class BaseAgent(BaseModel, ABC):
 
     def __init__(self, **data):
         super().__init__(**data)
+        # Plain attribute fix-ups instead of a model_validator: an
+        # "after" validator re-runs Pydantic's validation machinery on
+        # every instantiation, which is pure overhead for agents built
+        # per connection
+        if self.llm is None or not isinstance(self.llm, LLM):
+            self.llm = LLM(config_name=self.name.lower())
+        if not isinstance(self.memory, Memory):
+            self.memory = Memory()
         self.thinking_enabled = True
         self.progress_enabled = True
+        # Rolling count of assistant-message content hashes for O(1) stuck
+        # checks, bounded by the recency window below: without eviction any
+        # content repeated often enough over a long run would trip
+        # is_stuck() forever
+        self._assistant_hashes: Counter = Counter()
+        self._assistant_hash_window: deque = deque(maxlen=128)
+        # SimHash fingerprints of recent assistant messages for near-duplicate checks
+        self._assistant_simhashes: deque = deque(maxlen=128)
+        # Most recent user message, so steps need not rescan the history
+        self._last_user_message: Optional[str] = None
+        # Connection-local websocket/batcher bindings (see _bind_websocket)
+        self._ws = None
+        self._ws_batcher = None
+        # Count content where it actually enters Memory: the ToolCall
+        # family adds assistant messages via memory.add_message directly,
+        # bypassing update_memory, so hooking Memory is the only point
+        # that sees every path
+        self._attach_memory_observer()
 
     class Config:
         arbitrary_types_allowed = True
         extra = "allow"  # Allow extra fields for flexibility in subclasses
 
-    @model_validator(mode="after")
-    def initialize_agent(self) -> "BaseAgent":
-        """Initialize agent with default settings if not provided."""
-        if self.llm is None or not isinstance(self.llm, LLM):
-            self.llm = LLM(config_name=self.name.lower())
-        if not isinstance(self.memory, Memory):
-            self.memory = Memory()
-        return self
-
     @asynccontextmanager
     async def state_context(self, new_state: AgentState):
         """Context manager for safe agent state transitions.
@@ -94,20 +149,41 @@ class BaseAgent(BaseModel, ABC):
         **kwargs,
     ) -> None:
         """Add a message to the agent's memory."""
-        message_map = {
-            "user": Message.user_message,
-            "system": Message.system_message,
-            "assistant": Message.assistant_message,
-            "tool": lambda content, **kw: Message.tool_message(content, **kw),
-        }
-
-        if role not in message_map:
+        msg_factory = _MESSAGE_MAP.get(role)
+        if msg_factory is None:
             raise ValueError(f"Unsupported message role: {role}")
 
-        msg_factory = message_map[role]
         msg = msg_factory(content, **kwargs) if role == "tool" else msg_factory(content)
         await self.memory.add_message(msg)
 
+    def _attach_memory_observer(self) -> None:
+        """Subscribe stuck-detection bookkeeping to the current Memory.
+
+        Must be re-called whenever self.memory is swapped for a fresh
+        instance (e.g. the per-connection checkout reset).
+        """
+        if self._observe_message not in self.memory._observers:
+            self.memory.add_observer(self._observe_message)
+
+    async def _observe_message(self, message: Message) -> None:
+        """Track duplicate fingerprints and the latest user message"""
+        if message.role == "assistant" and message.content:
+            self._record_assistant_hash(hash(message.content))
+            self._assistant_simhashes.append(_simhash(message.content))
+        elif message.role == "user":
+            self._last_user_message = message.content
+
+    def _record_assistant_hash(self, content_hash: int) -> None:
+        """Count a content hash, evicting the one aged out of the window"""
+        window = self._assistant_hash_window
+        if len(window) == window.maxlen:
+            oldest = window.popleft()
+            self._assistant_hashes[oldest] -= 1
+            if self._assistant_hashes[oldest] <= 0:
+                del self._assistant_hashes[oldest]
+        window.append(content_hash)
+        self._assistant_hashes[content_hash] += 1
+
     async def run(self, request: Optional[str] = None) -> str:
         """Execute the agent's main loop asynchronously."""
         if self.state != AgentState.IDLE:
@@ -164,10 +240,12 @@ class BaseAgent(BaseModel, ABC):
 
     def handle_stuck_state(self):
         """Handle stuck state by adding a prompt to change strategy"""
-        stuck_prompt = "\
-        Observed duplicate responses. Consider new strategies and avoid repeating ineffective paths already attempted."
-        self.next_step_prompt = f"{stuck_prompt}\n{self.next_step_prompt}"
-        logger.warning(f"Agent detected stuck state. Added prompt: {stuck_prompt}")
+        # Prepend once; repeated stuck iterations would otherwise grow the
+        # prompt without bound
+        if self.next_step_prompt and self.next_step_prompt.startswith(_STUCK_PREFIX):
+            return
+        self.next_step_prompt = f"{_STUCK_PREFIX}\n{self.next_step_prompt or ''}"
+        logger.warning(f"Agent detected stuck state. Added prompt: {_STUCK_PREFIX}")
 
     def is_stuck(self) -> bool:
         """Check if the agent is stuck in a loop by detecting duplicate content"""
@@ -178,14 +256,20 @@ class BaseAgent(BaseModel, ABC):
         if not last_message.content:
             return False
 
-        # Count identical content occurrences
-        duplicate_count = sum(
+        # The counter includes the latest message itself, so strictly-greater
+        # means at least duplicate_threshold earlier identical responses
+        if self._assistant_hashes[hash(last_message.content)] > self.duplicate_threshold:
+            return True
+
+        # Catch near-duplicates (lightly rephrased repeats) that the exact
+        # hash misses, via Hamming distance on SimHash fingerprints
+        current = _simhash(last_message.content)
+        near_duplicates = sum(
             1
-            for msg in reversed(self.memory.messages[:-1])
-            if msg.role == "assistant" and msg.content == last_message.content
+            for fp in self._assistant_simhashes
+            if (fp ^ current).bit_count() <= _SIMHASH_NEAR_BITS
         )
-
-        return duplicate_count >= self.duplicate_threshold
+        return near_duplicates > self.duplicate_threshold
 
     @property
     def messages(self) -> List[Message]:
@@ -195,35 +279,52 @@ class BaseAgent(BaseModel, ABC):
     @messages.setter
     def messages(self, value: List[Message]):
         """Set the list of messages in the agent's memory."""
-        self.memory.messages = value
+        self.memory.replace(value)
 
     async def process_message(self, message: str) -> Dict[str, Any]:
         """Process a user message and return a response"""
         # Override in subclasses
         pass
         
+    def _bind_websocket(self):
+        """Bind the active websocket/batcher locally.
+
+        Caching the connection at bind time keeps the per-event send path
+        to a single attribute load instead of re-reading the config object
+        for every streamed event.
+        """
+        self._ws = config.websocket
+        self._ws_batcher = config.ws_batcher
+
+    async def _send_event(self, event: Dict[str, Any]):
+        """Send an event to the frontend, batching through the coalescing
+        buffer when one is attached to the connection."""
+        batcher = self._ws_batcher
+        if batcher is not None:
+            await batcher.enqueue(event)
+        else:
+            await send_event(self._ws, event)
+
     async def send_thinking(self, thought: str):
         """Send thinking update to frontend"""
-        if self.thinking_enabled and config.websocket:
-            await config.websocket.send_json({
+        if self.thinking_enabled and self._ws is not None:
+            await self._send_event({
                 "type": "thinking",
                 "content": thought
             })
-            # Add small delay for realistic effect
-            await asyncio.sleep(0.5)
-            
+
     async def send_progress(self, step: str):
         """Send progress update to frontend"""
-        if self.progress_enabled and config.websocket:
-            await config.websocket.send_json({
+        if self.progress_enabled and self._ws is not None:
+            await self._send_event({
                 "type": "progress",
                 "content": step
             })
-            
+
     async def send_result(self, content: str, files: Optional[List[Dict]] = None):
         """Send final result with any file attachments"""
-        if config.websocket:
-            await config.websocket.send_json({
+        if self._ws is not None:
+            await self._send_event({
                 "type": "result",
                 "content": content,
                 "files": files or []
@@ -1,9 +1,10 @@
 from pydantic import Field
 import asyncio
 import os
-from typing import List, Dict, Any, Optional
+import re
+from collections import deque
+from typing import List, Dict, Any
 
-from app.agent.toolcall import ToolCallAgent
 from app.prompt.manus import NEXT_STEP_PROMPT, SYSTEM_PROMPT
 from app.tool import Terminate, ToolCollection
 from app.tool.browser_use_tool import BrowserUseTool
@@ -12,7 +13,22 @@ from app.tool.google_search import GoogleSearch
 from app.tool.python_execute import PythonExecute
 from app.agent.base import BaseAgent
 from app.tool.base import BaseTool
-from app.llm import LLM
+from app.logger import logger
+
+
+# Precompiled keyword/extension tables for step dispatch - avoids repeated
+# str.lower() allocations and substring rescans on every plan step.
+# Checked in order: category priority (save > browse > code) decides the
+# route, not whichever keyword happens to appear first in the step text.
+_TOOL_PATTERNS = (
+    (re.compile(r"save|create file", re.I), "file_saver"),
+    (re.compile(r"browse|search", re.I), "browser_use"),
+    (re.compile(r"code|script", re.I), "python_execute"),
+)
+_EXT_TO_TYPE = {".html": "html", ".txt": "text", ".md": "markdown", ".json": "json"}
+
+# Matches one bulleted ("- ", "* ") or numbered ("1. ", "1) ") plan line
+_STEP_RE = re.compile(r"^[ \t]*(?:[-*]\s+|\d+[.)]\s+)(.+)$", re.M)
 
 
 class Manus(BaseAgent):
@@ -63,30 +79,45 @@ class Manus(BaseAgent):
         self.conversation_history = []
         self.thinking_enabled = True
         self.progress_enabled = True
+        # Callback wired by the WebSocket handler; None until a client is
+        # connected, so senders can test it with a plain attribute load
+        self.send_websocket_message = None
+        # Browser events emitted before the WebSocket callback is wired are
+        # held here; bounded so a slow/absent client cannot grow memory
+        self._pending_events = deque(maxlen=1024)
+        # O(1) name -> tool lookups into the tool collection
+        self._tools_by_name = self.available_tools.tool_map
 
     async def initialize(self):
         """Initialize agent and its tools"""
+        # Bind the active websocket/batcher for the send_* fast path
+        self._bind_websocket()
+
         # Connect browser tool to agent's event handler
-        browser_tool = self.available_tools.get_tool("browser_use")
+        browser_tool = self._tools_by_name.get("browser_use")
         if browser_tool:
             browser_tool.event_handler = self.send_browser_event
-            print("Connected browser tool to event handler")
-        
-        return await super().initialize()
+            logger.debug("Connected browser tool to event handler")
+
+        # Replay any events buffered before the callback was available.
+        # The callback check keeps this from re-buffering the same event
+        # forever when no client is wired yet.
+        while self._pending_events and self.send_websocket_message is not None:
+            await self.send_browser_event(self._pending_events.popleft())
+
+        return self
 
     async def send_browser_event(self, event_data):
         """Send browser events to the frontend"""
-        print(f"Sending browser event from agent: {event_data}")
-        if hasattr(self, 'send_websocket_message'):
+        logger.debug("Sending browser event from agent: %s", event_data)
+        if self.send_websocket_message is not None:
             try:
                 await self.send_websocket_message(event_data)
-                print("Browser event sent to WebSocket")
             except Exception as e:
-                print(f"Error sending browser event: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.error("Error sending browser event: %s", e, exc_info=True)
         else:
-            print("Warning: send_websocket_message not available")
+            logger.warning("send_websocket_message not available, buffering event")
+            self._pending_events.append(event_data)
 
     async def process_message(self, message: str) -> Dict[str, Any]:
         """Process user message with thinking, progress updates, and results"""
@@ -95,8 +126,7 @@ class Manus(BaseAgent):
         
         # 1. Initial thinking about the task
         await self.send_thinking(f"Analyzing your request: {message}")
-        await asyncio.sleep(1)
-        
+
         # 2. Generate a plan with multiple steps
         await self.send_thinking("Developing a structured approach to help with your request...")
         
@@ -111,19 +141,23 @@ class Manus(BaseAgent):
         for step in plan_steps:
             await self.send_thinking(f"Planning: {step}")
         
-        # 4. Execute plan with progress updates
-        results = []
+        # 4. Execute plan concurrently with progress updates. Steps are
+        # independent I/O-bound tool/LLM calls, so run them in parallel but
+        # cap concurrency to avoid overwhelming the LLM backend.
         files = []
-        
-        for i, step in enumerate(plan_steps):
-            # Show progress 
-            await self.send_progress(f"Working on step {i+1}/{len(plan_steps)}: {step}")
-            
-            # Execute step using LLM and tools
-            step_result = await self._execute_step(step, message)
-            results.append(step_result)
-            
-            # If step produced files, collect them
+        semaphore = asyncio.Semaphore(4)
+
+        async def run_step(i: int, step: str) -> Dict[str, Any]:
+            async with semaphore:
+                await self.send_progress(f"Working on step {i+1}/{len(plan_steps)}: {step}")
+                return await self._execute_step(step, message)
+
+        results = list(await asyncio.gather(
+            *(run_step(i, step) for i, step in enumerate(plan_steps))
+        ))
+
+        # Collect any files the steps produced, preserving plan order
+        for step_result in results:
             if "files" in step_result:
                 files.extend(step_result["files"])
         
@@ -139,26 +173,28 @@ class Manus(BaseAgent):
         """Execute a single step of the plan"""
         # Determine which tool to use based on step
         tool_name = self._determine_tool(step)
-        
-        if tool_name in self.tools:
+
+        # Prefer an explicitly injected tool, falling back to the collection
+        tool = self.tools.get(tool_name) or self._tools_by_name.get(tool_name)
+        if tool:
             # Execute tool
             await self.send_thinking(f"Using {tool_name} to {step}")
-            tool_result = await self.tools[tool_name].execute(step=step, context=context)
+            tool_result = await tool.execute(step=step, context=context)
             
             # Check if file was created
             if tool_name == "file_saver" and tool_result.output:
                 file_path = tool_result.output
-                file_name = os.path.basename(file_path)
-                file_type = self._determine_file_type(file_path)
-                file_size = os.path.getsize(file_path)
-                
+                # Single stat call plus string ops instead of three os.path helpers
+                file_name = file_path.rsplit(os.sep, 1)[-1]
+                file_size = os.stat(file_path).st_size
+
                 return {
                     "output": tool_result.output,
                     "files": [{
                         "name": file_name,
-                        "type": file_type,
+                        "type": self._determine_file_type(file_name),
                         "path": file_path,
-                        "size": f"{file_size // 1024} KB"
+                        "size": f"{file_size >> 10} KB"
                     }]
                 }
             
@@ -171,48 +207,22 @@ class Manus(BaseAgent):
     
     def _determine_tool(self, step: str) -> str:
         """Determine which tool to use based on step description"""
-        if "save" in step.lower() or "create file" in step.lower():
-            return "file_saver"
-        elif "browse" in step.lower() or "search" in step.lower():
-            return "browser_use"
-        elif "code" in step.lower() or "script" in step.lower():
-            return "python_execute"
+        for pattern, tool in _TOOL_PATTERNS:
+            if pattern.search(step):
+                return tool
         return "none"
-    
+
     def _determine_file_type(self, file_path: str) -> str:
         """Determine file type from extension"""
         ext = os.path.splitext(file_path)[1].lower()
-        if ext == ".html":
-            return "html"
-        elif ext == ".txt":
-            return "text"
-        elif ext == ".md":
-            return "markdown"
-        elif ext == ".json":
-            return "json"
-        return "file"
+        return _EXT_TO_TYPE.get(ext, "file")
     
     def _extract_steps(self, plan: str) -> List[str]:
         """Extract steps from a plan text"""
-        lines = plan.strip().split("\n")
-        steps = []
-        
-        for line in lines:
-            line = line.strip()
-            # Look for numbered steps or bullet points
-            if (line.startswith("- ") or 
-                line.startswith("* ") or 
-                (line[0].isdigit() and line[1:3] in [". ", ") "])):
-                
-                # Remove the bullet or number
-                step = line[2:] if line[0] in "-*" else line[line.index(" ")+1:]
-                steps.append(step)
-        
+        steps = _STEP_RE.findall(plan)
+
         # If no structured steps found, create at least one
-        if not steps and plan:
-            steps = [plan]
-            
-        return steps
+        return steps or ([plan] if plan else [])
     
     async def _generate_final_response(self, message: str, results: List[Dict[str, Any]]) -> str:
         """Generate a final response summarizing all results"""
@@ -231,16 +241,12 @@ class Manus(BaseAgent):
         """Execute a single step in the agent's workflow."""
         # This will be called by the BaseAgent's run method
         # The simplest implementation is to delegate to our process_message logic
-        current_messages = self.memory.messages
-        if current_messages:
-            # Get the last user message if any
-            last_user_message = next((msg.content for msg in reversed(current_messages) 
-                                     if msg.role == "user"), None)
-            if last_user_message:
-                # Process this step based on the last user message
-                result = await self._execute_single_step(last_user_message)
-                return result.get("output", "Step completed")
-        
+        last_user_message = self._last_user_message
+        if last_user_message:
+            # Process this step based on the last user message
+            result = await self._execute_single_step(last_user_message)
+            return result.get("output", "Step completed")
+
         return "No action taken"
     
     async def _execute_single_step(self, context: str) -> Dict[str, Any]:
@@ -254,9 +260,10 @@ class Manus(BaseAgent):
         
         # Determine tool and execute
         tool_name = self._determine_tool(step_plan)
-        if tool_name in self.tools:
+        tool = self.tools.get(tool_name) or self._tools_by_name.get(tool_name)
+        if tool:
             # Use the appropriate tool
-            tool_result = await self.tools[tool_name].execute(step=step_plan, context=context)
+            tool_result = await tool.execute(step=step_plan, context=context)
             return {"output": tool_result.output}
         else:
             # Use LLM to generate a response
@@ -1,7 +1,6 @@
 from fastapi import APIRouter
-from app.api.endpoints import ws, health, browser
+from app.api.endpoints import ws, browser
 
 api_router = APIRouter()
-api_router.include_router(health.router, tags=["health"])
 api_router.include_router(ws.router, tags=["ws"])
-api_router.include_router(browser.router, prefix="/browser", tags=["browser"]) 
\ No newline at end of file
+api_router.include_router(browser.router, prefix="/browser", tags=["browser"])
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
+from app.logger import logger
+
 router = APIRouter()
 
-# In-memory storage for browser state
+# In-memory storage for browser state. The GET payload is serialized once
+# per update instead of per request, since the frontend polls this endpoint.
 current_browser_url = "https://example.com"
+_cached_url_payload: bytes = orjson.dumps({"url": current_browser_url})
 
 class UrlUpdate(BaseModel):
     url: str
@@ -12,12 +17,13 @@ class UrlUpdate(BaseModel):
 @router.get("/current-url")
 async def get_current_url():
     """Get the current browser URL"""
-    return {"url": current_browser_url}
+    return Response(content=_cached_url_payload, media_type="application/json")
 
 @router.post("/update-url")
 async def update_url(url_data: UrlUpdate):
     """Update the current browser URL"""
-    global current_browser_url
+    global current_browser_url, _cached_url_payload
     current_browser_url = url_data.url
-    print(f"Updated browser URL to: {current_browser_url}")
-    return {"status": "success", "url": current_browser_url} 
\ No newline at end of file
+    _cached_url_payload = orjson.dumps({"url": current_browser_url})
+    logger.debug("Updated browser URL to: %s", current_browser_url)
+    return {"status": "success", "url": current_browser_url}
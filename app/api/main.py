@@ -1,19 +1,21 @@
 import os
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-import traceback
 
-from app.config import config
-from app.api.websocket import WebSocketHandler
-from app.agent.manus import Manus
-from app.llm import LLM
-from app.tool.browser_use_tool import BrowserUseTool
-from app.tool.python_execute import PythonExecute
-from app.tool.file_saver import FileSaver
-from app.tool.google_search import GoogleSearch
-from app.tool import Terminate
+from app.api.api import api_router
+from app.api.websocket import agent, ws_handler
 from app.logger import logger
+from app.tool.http import close_shared_session
+
+# Use uvloop for the asyncio event loop when available - every await in the
+# agent/WebSocket path dispatches through the loop, so this is a cheap win
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+    logger.info("uvloop not installed, using default asyncio event loop")
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -31,32 +33,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize LLM with appropriate config
-llm = LLM()  # This will use the config from config.toml
-
-# Initialize tools
-tools_list = [
-    BrowserUseTool(),
-    PythonExecute(timeout=30),
-    FileSaver(),
-    GoogleSearch(),
-    Terminate()
-]
-
-# Convert tools list to dictionary before passing to Manus
-tools_dict = {tool.name: tool for tool in tools_list}
+# Single source of routes: the shared /ws endpoint plus browser endpoints
+app.include_router(api_router)
 
-try:
-    # Initialize agent with tools as a dictionary
-    agent = Manus(
-        llm=llm,
-        tools=tools_dict  # Pass as dictionary to satisfy Pydantic validation
-    )
-    ws_handler = WebSocketHandler(agent)
-except Exception as e:
-    logger.error(f"Error initializing agent: {e}")
-    logger.error(traceback.format_exc())
-    raise
+@app.on_event("shutdown")
+async def shutdown_http_session():
+    """Close the pooled outbound HTTP session the tools share"""
+    await close_shared_session()
 
 @app.get("/")
 async def root():
@@ -70,26 +53,18 @@ async def health_check():
         "components": {
             "agent": agent is not None,
             "websocket": ws_handler is not None,
-            "llm": llm is not None,
+            "llm": agent.llm is not None,
             "tools": {
-                tool_name: True for tool_name in tools_dict.keys()
+                tool_name: True for tool_name in agent.available_tools.tool_map
             }
         }
     }
 
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await ws_handler.connect(websocket)
-    try:
-        while True:
-            data = await websocket.receive_text()
-            await ws_handler.handle_message(websocket, data)
-    except WebSocketDisconnect:
-        await ws_handler.disconnect(websocket)
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
-        await ws_handler.disconnect(websocket)
-
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port) 
\ No newline at end of file
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop" if uvloop else "auto",
+    )
@@ -1,69 +1,199 @@
-import json
+import asyncio
+import logging
 import traceback
 from fastapi import WebSocket, WebSocketDisconnect
 from app.config import config
 from app.agent.manus import Manus
 from app.logger import logger
+from app.schema import AgentState, Memory
+from app.ws_batcher import WSBatcher, broadcast_event, loads, send_event, tune_write_buffer
+
+# Constructing a Manus (and its ToolCollection) is expensive, so idle
+# agents are pooled and reused across WebSocket connections. Each
+# connection checks one out with fresh per-connection state; sharing a
+# single live agent would leak one client's conversation into another's.
+_agent_pool: asyncio.Queue = asyncio.Queue()
+_POOL_MAX = 4
+
+
+def _checkout_agent() -> Manus:
+    """Get a pooled agent with fresh per-connection state, or build one"""
+    try:
+        agent = _agent_pool.get_nowait()
+    except asyncio.QueueEmpty:
+        return Manus()
+
+    agent.memory = Memory()
+    agent._attach_memory_observer()
+    agent.conversation_history = []
+    agent.current_step = 0
+    agent.state = AgentState.IDLE
+    agent._assistant_hashes.clear()
+    agent._assistant_hash_window.clear()
+    agent._assistant_simhashes.clear()
+    agent._last_user_message = None
+    # Browser events buffered after the previous client's callback was
+    # unwired must not replay into the next session
+    agent._pending_events.clear()
+    # Drop any stuck-prefixed prompt carried over from the last session
+    agent.next_step_prompt = type(agent).model_fields["next_step_prompt"].default
+    return agent
+
+
+async def _release_agent(agent: Manus) -> None:
+    """Return an agent to the pool, dropping it once the pool is full"""
+    agent.send_websocket_message = None
+    # Give the browser tool's page back to the page pool (this also
+    # detaches its nav listener and notify workers): a pooled agent that
+    # kept its page would pin one of the pool's pages per idle agent,
+    # eventually starving new connections of pages entirely
+    browser_tool = agent._tools_by_name.get("browser_use")
+    if browser_tool is not None:
+        try:
+            await browser_tool.cleanup()
+        except Exception as e:
+            logger.error("Error releasing browser tool: %s", e, exc_info=True)
+    if _agent_pool.qsize() < _POOL_MAX:
+        _agent_pool.put_nowait(agent)
+
 
 class WebSocketHandler:
     def __init__(self, agent):
+        # Template agent kept for health checks; live connections get
+        # their own checkout from the pool
         self.agent = agent
-        self.active_connections = set()
-        # Connect agent to websocket handler for callbacks
-        if hasattr(self.agent, 'send_websocket_message'):
-            self.agent.send_websocket_message = self.send_message
-    
+        # List rather than set: broadcast is iteration-dominated at small N,
+        # and dead sockets are pruned rather than left to fail every send
+        self.active_connections = []
+        # Per-connection coalescing batchers (see app.ws_batcher)
+        self.batchers = {}
+        # Per-connection agents, checked out on connect
+        self.agents = {}
+
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.add(websocket)
+        self.active_connections.append(websocket)
+        tune_write_buffer(websocket)
+        batcher = WSBatcher(websocket).start()
+        self.batchers[websocket] = batcher
         config.websocket = websocket
+        config.ws_batcher = batcher
+
+        # Check out an agent for this connection and wire its event
+        # stream to this socket only
+        agent = _checkout_agent()
+        self.agents[websocket] = agent
+
+        async def send_to_client(message):
+            await self._send_to(websocket, message)
+
+        agent.send_websocket_message = send_to_client
+
+        # Stream new assistant messages to the client through the batched
+        # send path: enqueueing is cheap and serialization happens in the
+        # batcher's single consumer task, so no per-message task churn
+        async def on_memory_message(message):
+            if message.role == "assistant" and message.content:
+                await self._send_to(websocket, {
+                    "type": "assistant",
+                    "content": message.content
+                })
+
+        agent.memory.add_observer(on_memory_message)
+        await agent.initialize()
+        # Pin the connection bindings explicitly: initialize() reads the
+        # process-wide config, which a concurrent connect may have moved
+        agent._ws = websocket
+        agent._ws_batcher = batcher
         logger.info("WebSocket connected")
-        
+
         # Send welcome message
-        await websocket.send_json({
+        await send_event(websocket, {
             "type": "system",
             "content": "Connected to OpenManus AI. How can I help you today?"
         })
-    
+
     async def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        batcher = self.batchers.pop(websocket, None)
+        if batcher:
+            await batcher.close()
+        agent = self.agents.pop(websocket, None)
+        if agent is not None:
+            await _release_agent(agent)
         if config.websocket == websocket:
+            config.ws_batcher = None
             config.websocket = None
         logger.info("WebSocket disconnected")
+
+    async def _send_to(self, websocket, message):
+        """Send a message to one connection through its batcher"""
+        # HTML payload sizes are only worth measuring when someone is
+        # actually reading debug logs; the isEnabledFor gate keeps the
+        # dict probes and formatting off the production path
+        if logger.isEnabledFor(logging.DEBUG):
+            content = message.get("content")
+            if isinstance(content, dict) and "html" in content:
+                logger.debug("HTML content length: %d", len(content["html"]))
+        batcher = self.batchers.get(websocket)
+        try:
+            if batcher:
+                await batcher.enqueue(message)
+            else:
+                await send_event(websocket, message)
+        except Exception as e:
+            logger.error(f"Error sending message: {e}")
+            await self.disconnect(websocket)
     
     async def send_message(self, message):
         """Send a message to all connected clients"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending message: {e}")
+        # Single client: go through its batcher so bursts coalesce.
+        # Multiple clients: serialize once and share the payload instead
+        # of re-encoding per connection.
+        if len(self.active_connections) == 1:
+            await self._send_to(self.active_connections[0], message)
+        else:
+            connections = list(self.active_connections)
+            results = await broadcast_event(connections, message)
+            # Drop sockets that failed so they stop costing an exception
+            # (and a log line) on every subsequent broadcast
+            for connection, result in zip(connections, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Dropping dead WebSocket connection: {result}")
+                    await self.disconnect(connection)
     
     async def handle_message(self, websocket: WebSocket, data: str):
         try:
-            logger.info(f"Received message: {data}")
-            message_data = json.loads(data)
+            logger.debug("Received message: %s", data)
+            message_data = loads(data)
             message_type = message_data.get("type", "")
             content = message_data.get("content", "")
-            
+
+            # The chat frontend sends bare {"prompt": ...} payloads
+            if not message_type and "prompt" in message_data:
+                message_type = "user_input"
+                content = message_data["prompt"]
+
             if message_type == "user_input":
-                # Process user message through agent
-                logger.info(f"Processing user input: {content}")
-                
+                # Process user message through this connection's agent
+                logger.debug("Processing user input: %s", content)
+                agent = self.agents.get(websocket, self.agent)
+
                 # Echo back the user message for display
-                await websocket.send_json({
+                await send_event(websocket, {
                     "type": "user",
                     "content": content
                 })
-                
+
                 # Process with the agent
                 try:
-                    await self.agent.process_message(content)
+                    await agent.process_message(content)
                 except Exception as e:
                     error_msg = f"Error processing message: {str(e)}"
                     logger.error(error_msg)
                     logger.error(traceback.format_exc())
-                    await websocket.send_json({
+                    await send_event(websocket, {
                         "type": "error",
                         "content": error_msg
                     })
@@ -72,7 +202,7 @@ class WebSocketHandler:
                 # Handle browser action
                 action = message_data.get("action", "")
                 details = message_data.get("details", {})
-                logger.info(f"Browser action: {action}, details: {details}")
+                logger.debug("Browser action: %s, details: %s", action, details)
                 
                 # Could process browser actions here
         
@@ -83,7 +213,13 @@ class WebSocketHandler:
             logger.error(traceback.format_exc())
             
             if websocket in self.active_connections:
-                await websocket.send_json({
+                await send_event(websocket, {
                     "type": "error",
                     "content": error_msg
-                }) 
\ No newline at end of file
+                })
+
+
+# Template agent (health checks, tool introspection) and the shared
+# handler; live connections check their own agents out of the pool
+agent = Manus()
+ws_handler = WebSocketHandler(agent)
\ No newline at end of file
@@ -36,6 +36,8 @@ class Config:
 
     # Add websocket attribute
     websocket = None
+    # Batching buffer wrapping the active websocket (see app.ws_batcher)
+    ws_batcher = None
 
     def __new__(cls):
         if cls._instance is None:
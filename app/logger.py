@@ -1,7 +1,14 @@
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import (
+    MemoryHandler,
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
 
 # Create logs directory if it doesn't exist
 logs_dir = Path("logs")
@@ -17,7 +24,6 @@ def setup_logger(name: str = "app"):
     console_handler.setLevel(logging.INFO)
     console_formatter = logging.Formatter('%(message)s')  # Just show the message
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
 
     # File handler with detailed format for debugging
     file_handler = RotatingFileHandler(
@@ -30,7 +36,25 @@ def setup_logger(name: str = "app"):
         '%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d - %(message)s'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+
+    # Buffer file records in memory and flush in chunks (or immediately on
+    # ERROR), turning thousands of tiny rotating-file writes into a few
+    # large ones; flushOnClose drains the buffer at shutdown
+    buffered_file_handler = MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler
+    )
+    buffered_file_handler.setLevel(logging.DEBUG)
+
+    # Log records are handed off through a queue so the event-loop thread
+    # only does a put; formatting and disk writes happen on the listener's
+    # background thread instead of blocking asyncio
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(
+        log_queue, console_handler, buffered_file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
 
     return logger
 
@@ -1,8 +1,12 @@
+from collections import deque
 from enum import Enum
+from itertools import islice
 from typing import Any, List, Literal, Optional, Union, Callable
 import asyncio
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from app.logger import logger
 
 
 class AgentState(str, Enum):
@@ -36,6 +40,10 @@ class Message(BaseModel):
     name: Optional[str] = Field(default=None)
     tool_call_id: Optional[str] = Field(default=None)
 
+    # Messages are append-only, so the dict form is built once and reused
+    # across every to_dict_list() pass over the history
+    _cached_dict: Optional[dict] = PrivateAttr(default=None)
+
     def __add__(self, other) -> List["Message"]:
         """支持 Message + list 或 Message + Message 的操作"""
         if isinstance(other, list):
@@ -58,15 +66,32 @@ class Message(BaseModel):
 
     def to_dict(self) -> dict:
         """Convert message to dictionary format"""
+        if self._cached_dict is not None:
+            return self._cached_dict
+
         message = {"role": self.role}
         if self.content is not None:
             message["content"] = self.content
         if self.tool_calls is not None:
-            message["tool_calls"] = [tool_call.dict() for tool_call in self.tool_calls]
+            # Build plain dicts directly instead of going through Pydantic's
+            # recursive model_dump machinery per call
+            message["tool_calls"] = [
+                {
+                    "id": tool_call.id,
+                    "type": tool_call.type,
+                    "function": {
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments,
+                    },
+                }
+                for tool_call in self.tool_calls
+            ]
         if self.name is not None:
             message["name"] = self.name
         if self.tool_call_id is not None:
             message["tool_call_id"] = self.tool_call_id
+
+        self._cached_dict = message
         return message
 
     @classmethod
@@ -110,32 +135,68 @@ class Message(BaseModel):
 
 class Memory:
     def __init__(self):
-        self.messages: List[Message] = []
-        self._observers: List[Callable[[Message], None]] = []
         self.max_messages: int = 100
+        # Byte budget for retained content: tool calls can dump multi-KB
+        # HTML into messages, so a pure count cap lets the window balloon
+        # to whatever 100 such messages weigh. Prompt construction cost
+        # then tracks this budget rather than pathological tool output.
+        self.max_bytes: int = 200 * 1024
+        self.messages: deque = deque()
+        self._bytes_used: int = 0
+        self._observers: List[Callable[[Message], None]] = []
+
+    @staticmethod
+    def _message_bytes(message: Message) -> int:
+        return len(message.content or "")
+
+    def _append(self, message: Message) -> None:
+        """Append one message, trimming oldest-first to both caps.
+
+        The running byte counter makes each trim decision O(1); only the
+        messages actually evicted are touched. At least one message is
+        always kept so a single oversize payload is not dropped outright.
+        """
+        self.messages.append(message)
+        self._bytes_used += self._message_bytes(message)
+        while len(self.messages) > self.max_messages or (
+            self._bytes_used > self.max_bytes and len(self.messages) > 1
+        ):
+            self._bytes_used -= self._message_bytes(self.messages.popleft())
 
     async def add_message(self, message: Message):
         """Add a message and notify observers"""
         try:
-            self.messages.append(message)
-            # Notify all observers
-            for observer in self._observers:
-                try:
-                    await observer(message)
-                except Exception as e:
-                    logger.error(f"Error in observer: {str(e)}")
-            
-            # Optional: Implement message limit
-            if len(self.messages) > self.max_messages:
-                self.messages = self.messages[-self.max_messages:]
+            self._append(message)
+            await self._notify(message)
         except Exception as e:
             logger.error(f"Error adding message: {str(e)}")
             raise
 
+    async def _notify(self, *messages: Message):
+        """Fan out messages to observers concurrently"""
+        if not self._observers:
+            return
+        results = await asyncio.gather(
+            *(observer(message) for message in messages for observer in self._observers),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error in observer: {result}")
+
     async def add_messages(self, messages: List[Message]):
         """Add multiple messages asynchronously"""
         for message in messages:
-            await self.add_message(message)
+            self._append(message)
+        # One gather for the whole batch instead of N x M serial awaits
+        await self._notify(*messages)
+
+    def replace(self, messages: List[Message]) -> None:
+        """Replace the whole window, re-applying the count and byte caps"""
+        self.messages.clear()
+        self._bytes_used = 0
+        for message in messages:
+            self._append(message)
 
     def add_observer(self, observer: Callable[[Message], None]):
         """Add an observer to receive message updates"""
@@ -149,10 +210,11 @@ class Memory:
     def clear(self) -> None:
         """Clear all messages"""
         self.messages.clear()
+        self._bytes_used = 0
 
     def get_recent_messages(self, n: int) -> List[Message]:
         """Get n most recent messages"""
-        return self.messages[-n:]
+        return list(islice(self.messages, max(len(self.messages) - n, 0), None))
 
     def to_dict_list(self) -> List[dict]:
         """Convert messages to list of dicts"""
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class BaseTool(ABC, BaseModel):
@@ -9,6 +9,10 @@ class BaseTool(ABC, BaseModel):
     description: str
     parameters: Optional[dict] = None
 
+    # Name/description/parameters are fixed after construction, so the
+    # function-call schema is built once and reused every LLM turn
+    _param_cache: Optional[Dict] = PrivateAttr(default=None)
+
     class Config:
         arbitrary_types_allowed = True
 
@@ -22,14 +26,16 @@ class BaseTool(ABC, BaseModel):
 
     def to_param(self) -> Dict:
         """Convert tool to function call format."""
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters,
-            },
-        }
+        if self._param_cache is None:
+            self._param_cache = {
+                "type": "function",
+                "function": {
+                    "name": self.name,
+                    "description": self.description,
+                    "parameters": self.parameters,
+                },
+            }
+        return self._param_cache
 
 
 class ToolResult(BaseModel):
@@ -2,27 +2,184 @@ import asyncio
 import json
 import os
 import base64
+import time
+from collections import deque
 from typing import Optional, Callable, Dict, Any, List
 from PIL import Image
 from playwright.async_api import async_playwright, Browser, Page
 from datetime import datetime
-import aiohttp
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from browser_use import Browser as BrowserUseBrowser
 from browser_use import BrowserConfig
 from browser_use.browser.context import BrowserContext
 from browser_use.dom.service import DomService
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
 from app.tool.base import BaseTool, ToolResult
+from app.tool.http import get_shared_session
 from app.logger import setup_logger
 
 MAX_LENGTH = 2000
 logger = setup_logger("browser_tool")
 
+# Local browser API server (see browser_api.py)
+_BROWSER_API = "http://localhost:8001"
+
+# AIMD bounds for the URL-notification workers: average latency above the
+# target (or any failure) halves concurrency, success grows it by one
+_NOTIFY_MIN_CONC = 1
+_NOTIFY_MAX_CONC = 16
+_NOTIFY_TARGET_LATENCY = 0.2  # seconds
+
+
+class _BrowserPool:
+    """One shared Chromium with a queue of pre-warmed pages.
+
+    Launching Chromium costs seconds; with the pool, every tool instance
+    borrows a ready page from the same browser instead of relaunching,
+    and concurrent tools run on distinct pages rather than serializing
+    on one. Pool size comes from BROWSER_PAGE_POOL (default 4).
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or int(os.environ.get("BROWSER_PAGE_POOL", 4))
+        self.browser: Optional[Browser] = None
+        self._playwright = None
+        self._context = None
+        self._pages: Optional[asyncio.Queue] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> "_BrowserPool":
+        async with self._lock:
+            if self.browser is None:
+                logger.info("Launching shared browser (pool size %d)...", self.size)
+                self._playwright = await async_playwright().start()
+                self.browser = await self._playwright.chromium.launch(headless=True)
+                self._context = await self.browser.new_context()
+                self._pages = asyncio.Queue()
+                for _ in range(self.size):
+                    self._pages.put_nowait(await self._context.new_page())
+        return self
+
+    async def acquire(self) -> Page:
+        """Borrow a warm page, launching the shared browser on first use"""
+        await self.start()
+        return await self._pages.get()
+
+    async def release(self, page: Page) -> None:
+        """Return a page to the pool, reset so the next borrower starts clean"""
+        if self._pages is None:
+            return
+        try:
+            await page.goto("about:blank")
+        except Exception:
+            # The page died with its borrower; replace it to keep pool size
+            try:
+                page = await self._context.new_page()
+            except Exception:
+                return
+        self._pages.put_nowait(page)
+
+    async def close(self) -> None:
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        self._context = None
+        self._pages = None
+
+
+_page_pool = _BrowserPool()
+
+
+async def warm_browser_pool() -> None:
+    """Pre-launch the shared browser so a later browse starts warm.
+
+    Safe to fire-and-forget: failures are logged and the next
+    _ensure_browser simply retries the launch.
+    """
+    try:
+        await _page_pool.start()
+    except Exception:
+        logger.debug("Browser pool warmup failed", exc_info=True)
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+except ImportError:
+    BeautifulSoup = None
+    SoupStrainer = None
+
+# Optional fast path: resiliparse extracts main-content text entirely in
+# C, an order of magnitude faster than walking a soup tree in Python
+try:
+    from resiliparse.extract.html2text import extract_plain_text
+    from resiliparse.parse.html import HTMLTree
+except ImportError:
+    extract_plain_text = None
+    HTMLTree = None
+
+# Tags worth keeping when extracting readable text; everything else is
+# skipped at parse time so libxml2 never builds nodes for scripts,
+# navigation chrome, etc.
+_CONTENT_TAGS = ("title", "article", "main", "body")
+
+
+def _content_strainer():
+    if SoupStrainer is None:
+        return None
+
+    def _keep(name, attrs):
+        if name in _CONTENT_TAGS:
+            return True
+        if name == "div":
+            if attrs.get("id") in ("content", "main"):
+                return True
+            classes = attrs.get("class") or ()
+            return any(c in ("content", "main") for c in classes)
+        return False
+
+    return SoupStrainer(_keep)
+
+
+_STRAINER = _content_strainer()
+
+
+def _extract_text(html_content: str) -> str:
+    """Extract readable text from an HTML document.
+
+    Parsing dominates CPU once a page has arrived, so try resiliparse's
+    C extractor first, then the lxml parser restricted to content-bearing
+    tags; fall back to the stdlib parser (or the raw markup) when the
+    faster stacks are missing.
+    """
+    if extract_plain_text is not None:
+        try:
+            text = extract_plain_text(
+                HTMLTree.parse(html_content), main_content=True, alt_texts=False
+            )
+            if text:
+                return text
+        except Exception:
+            logger.debug("resiliparse extraction failed", exc_info=True)
+    if BeautifulSoup is None:
+        return html_content
+    try:
+        soup = BeautifulSoup(html_content, "lxml", parse_only=_STRAINER)
+    except Exception:
+        soup = BeautifulSoup(html_content, "html.parser")
+    text = soup.get_text(separator=" ", strip=True)
+    return text or html_content
+
 class BrowserUseTool(BaseTool):
     name: str = "browser_use"
     description: str = """Interact with a web browser to perform various actions."""
@@ -36,40 +193,95 @@ class BrowserUseTool(BaseTool):
     # Add base directory for local files
     base_dir: str = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
+    # URL-change notifications flow through a bounded queue drained by an
+    # AIMD-sized worker pool instead of one fire-and-forget task per
+    # framenavigated event, so a stalled event sink cannot pile up tasks
+    _notify_queue: Optional[asyncio.Queue] = PrivateAttr(default=None)
+    _notify_workers: List[asyncio.Task] = PrivateAttr(default_factory=list)
+    _notify_conc: int = PrivateAttr(default=4)
+    _notify_latencies: deque = PrivateAttr(default_factory=lambda: deque(maxlen=32))
+    _nav_handler: Optional[Callable] = PrivateAttr(default=None)
+    _last_notified_url: Optional[str] = PrivateAttr(default=None)
+
     async def _ensure_browser(self) -> None:
-        """Ensure browser is initialized"""
-        if not self.browser:
-            logger.info("Initializing browser...")
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(
-                headless=True  # Run in headless mode
-            )
-            self.page = await self.browser.new_page()
-            
+        """Ensure this tool holds a page from the shared browser pool"""
+        if not self.page:
+            self.page = await _page_pool.acquire()
+            self.browser = _page_pool.browser
+            # Warm the process-wide HTTP session so the first URL
+            # notification does not pay connector setup
+            await get_shared_session()
+            self._notify_queue = asyncio.Queue(maxsize=256)
+            self._spawn_notify_workers()
+
             # Set up event handlers
             def handle_navigation(frame):
-                if frame is self.page.main_frame:
-                    asyncio.create_task(self._notify_url_change(frame.url))
-            
+                if self.page is not None and frame is self.page.main_frame:
+                    queue = self._notify_queue
+                    if queue.full():
+                        # Latest URL wins; dropping the oldest pending
+                        # notification loses nothing the sink still needs
+                        queue.get_nowait()
+                    queue.put_nowait(frame.url)
+
+            self._nav_handler = handle_navigation
             self.page.on("framenavigated", handle_navigation)
-            logger.info("Browser initialized successfully")
+            logger.info("Browser page acquired from pool")
+
+    def _spawn_notify_workers(self) -> None:
+        """Keep the worker pool at the current AIMD concurrency level"""
+        self._notify_workers = [t for t in self._notify_workers if not t.done()]
+        while len(self._notify_workers) < self._notify_conc:
+            index = len(self._notify_workers)
+            self._notify_workers.append(
+                asyncio.create_task(self._notify_worker(index))
+            )
+
+    async def _notify_worker(self, index: int) -> None:
+        """Drain queued URL notifications, adapting pool size to latency"""
+        while index < self._notify_conc:
+            url = await self._notify_queue.get()
+            start = time.monotonic()
+            ok = await self._notify_url_change(url)
+            self._adjust_notify_concurrency(time.monotonic() - start, ok)
+
+    def _adjust_notify_concurrency(self, latency: float, ok: bool) -> None:
+        """AIMD: halve the pool on failure/slowness, otherwise grow by one"""
+        self._notify_latencies.append(latency)
+        average = sum(self._notify_latencies) / len(self._notify_latencies)
+        if not ok or average > _NOTIFY_TARGET_LATENCY:
+            self._notify_conc = max(_NOTIFY_MIN_CONC, self._notify_conc // 2)
+        elif self._notify_conc < _NOTIFY_MAX_CONC:
+            self._notify_conc += 1
+            self._spawn_notify_workers()
 
-    async def _notify_url_change(self, url: str) -> None:
-        """Notify frontend of URL changes via API endpoint"""
+    async def _notify_url_change(self, url: str) -> bool:
+        """Notify frontend of URL changes via API endpoint.
+
+        Returns whether the API accepted the update, which feeds the
+        AIMD concurrency adjustment in the notify workers.
+        """
+        # SPA redirects and hash changes replay the same URL many times;
+        # the sink only cares about transitions, so skip exact repeats
+        # (covers the event-handler fallback below as well)
+        if url == self._last_notified_url:
+            return True
+        self._last_notified_url = url
+
+        ok = False
         try:
-            print(f"Updating URL to: {url}")
-            # Change port to 8001 to match our test server
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "http://localhost:8001/api/browser/update-url", 
-                    json={"url": url}
-                ) as response:
-                    if response.status == 200:
-                        print(f"Successfully updated URL via API")
-                    else:
-                        print(f"Failed to update URL: {await response.text()}")
+            logger.debug("Updating URL to: %s", url)
+            session = await get_shared_session()
+            async with session.post(
+                f"{_BROWSER_API}/api/browser/update-url", json={"url": url}
+            ) as response:
+                if response.status == 200:
+                    ok = True
+                    logger.debug("Successfully updated URL via API")
+                else:
+                    logger.warning("Failed to update URL: %s", await response.text())
         except Exception as e:
-            print(f"Error updating URL: {e}")
+            logger.error(f"Error updating URL: {e}")
             
         # Still try the event handler as a fallback
         if self.event_handler:
@@ -79,16 +291,17 @@ class BrowserUseTool(BaseTool):
                     "content": {"url": url}
                 })
             except Exception as e:
-                print(f"Error with event handler: {e}")
+                logger.error(f"Error with event handler: {e}")
+        return ok
 
     async def _update_url(self, url: str) -> None:
         """Update the current URL in the browser state"""
         try:
-            async with aiohttp.ClientSession() as session:
-                await session.post(
-                    "http://localhost:8001/api/browser/update-url",
-                    json={"url": url}
-                )
+            session = await get_shared_session()
+            async with session.post(
+                f"{_BROWSER_API}/api/browser/update-url", json={"url": url}
+            ):
+                pass
         except Exception as e:
             logger.error(f"Failed to update URL: {e}")
 
@@ -110,15 +323,24 @@ class BrowserUseTool(BaseTool):
                         filepath = os.path.join(self.base_dir, filepath)
 
                     # Get file contents from server
-                    async with aiohttp.ClientSession() as session:
-                        response = await session.post(
-                            "http://localhost:8001/api/browser/open-local-file",
-                            json={"file_path": filepath}
-                        )
+                    session = await get_shared_session()
+                    async with session.post(
+                        f"{_BROWSER_API}/api/browser/open-local-file",
+                        json={"file_path": filepath}
+                    ) as response:
                         if response.status == 200:
-                            data = await response.json()
+                            # Prefer raw text/html from the server: JSON
+                            # wrapping forces a full parse of the HTML blob
+                            # just to unwrap one string field
+                            content_type = response.headers.get("Content-Type", "")
+                            if content_type.startswith("text/html"):
+                                html = await response.text()
+                            elif orjson is not None:
+                                html = orjson.loads(await response.read())["content"]
+                            else:
+                                html = (await response.json())["content"]
                             # Set content directly in page
-                            await self.page.set_content(data["content"])
+                            await self.page.set_content(html)
                             # Update URL to show filepath
                             await self._update_url(f"file://{filepath}")
                             return ToolResult(output=f"Loaded local file: {filepath}")
@@ -126,7 +348,12 @@ class BrowserUseTool(BaseTool):
                             error_text = await response.text()
                             return ToolResult(error=f"Failed to load file: {error_text}")
                 elif url:
-                    await self.page.goto(url, wait_until="networkidle")
+                    # domcontentloaded returns as soon as the DOM is usable;
+                    # networkidle adds a pessimistic half-second-after-quiet
+                    # timer that ad-heavy pages stretch into seconds. Readers
+                    # wait for a settled DOM themselves (see the read action).
+                    wait_until = kwargs.get("wait_until", "domcontentloaded")
+                    await self.page.goto(url, wait_until=wait_until, timeout=15000)
                     return ToolResult(output=f"Navigated to {url}")
                 else:
                     return ToolResult(error="Either URL or filepath is required")
@@ -142,8 +369,26 @@ class BrowserUseTool(BaseTool):
                 return ToolResult(output=f"Clicked element: {selector}")
 
             elif action == "read":
-                # Get page content
-                content = await self.page.content()
+                # Navigation no longer waits for network idle, so give the
+                # DOM a bounded chance to settle before reading it
+                try:
+                    await self.page.wait_for_load_state("networkidle", timeout=5000)
+                except Exception:
+                    pass  # read whatever is there rather than fail
+                # Slice the text inside V8: page.content() ships the whole
+                # serialized DOM (possibly MBs) over CDP just to keep the
+                # first MAX_LENGTH chars, while innerText.slice sends only
+                # what we return. Fall back to pulling the markup and
+                # extracting in a worker thread if evaluation fails.
+                try:
+                    content = await self.page.evaluate(
+                        "() => (document.body.innerText"
+                        " || document.documentElement.innerText"
+                        f" || '').slice(0, {MAX_LENGTH})"
+                    )
+                except Exception:
+                    html_content = await self.page.content()
+                    content = await asyncio.to_thread(_extract_text, html_content)
                 return ToolResult(output=f"Read page content: {content[:MAX_LENGTH]}")
 
             elif action == "type":
@@ -163,18 +408,47 @@ class BrowserUseTool(BaseTool):
             return ToolResult(error=str(e))
 
     async def cleanup(self) -> None:
-        """Clean up browser resources"""
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
+        """Release pooled resources held by this tool instance.
+
+        The shared browser stays up for the next borrower; only this
+        tool's page goes back to the pool (see _page_pool.close() for
+        process shutdown).
+        """
+        for worker in self._notify_workers:
+            worker.cancel()
+        self._notify_workers = []
+        # The shared HTTP session is process-wide and stays open here;
+        # app shutdown closes it via close_shared_session()
+        if self.page:
+            if self._nav_handler is not None:
+                try:
+                    self.page.remove_listener("framenavigated", self._nav_handler)
+                except Exception:
+                    pass
+                self._nav_handler = None
+            await _page_pool.release(self.page)
             self.page = None
+            self.browser = None
+
+    async def __aenter__(self) -> "BrowserUseTool":
+        await self._ensure_browser()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.cleanup()
 
     def __del__(self) -> None:
-        """Ensure cleanup when object is destroyed"""
-        if self.browser:
-            try:
-                asyncio.run(self.cleanup())
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                loop.run_until_complete(self.cleanup())
-                loop.close()
+        """Best-effort close if cleanup() was never awaited.
+
+        Never build or run an event loop here: asyncio.run inside a
+        destructor can deadlock during interpreter shutdown. If a loop is
+        still running, schedule cleanup on it; otherwise there is nothing
+        safe to do and the OS reclaims the browser process.
+        """
+        if not self.page:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self.cleanup())
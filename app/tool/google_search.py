@@ -1,9 +1,17 @@
 import asyncio
 from typing import List
 
+from cachetools import TTLCache
 from googlesearch import search
 
 from app.tool.base import BaseTool
+from app.tool.browser_use_tool import warm_browser_pool
+from app.tool.http import throttled
+
+# Repeated identical queries are common when an agent re-asks for the
+# same information; the scrape behind search() costs seconds, so recent
+# result lists are kept for five minutes
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
 
 
 class GoogleSearch(BaseTool):
@@ -39,10 +47,25 @@ The tool returns a list of URLs that match the search query.
         Returns:
             List[str]: A list of URLs matching the search query.
         """
-        # Run the search in a thread pool to prevent blocking
-        loop = asyncio.get_event_loop()
-        links = await loop.run_in_executor(
-            None, lambda: list(search(query, num_results=num_results))
-        )
+        cache_key = (query, num_results)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        # Agents almost always open a result right after searching, so
+        # launch the shared browser concurrently with the scrape instead
+        # of paying for it serially on the follow-up browse
+        asyncio.ensure_future(warm_browser_pool())
+
+        # Run the search in a thread pool to prevent blocking, under the
+        # global outbound caps: concurrent agents each firing scrapes
+        # would otherwise hammer Google until it starts rate-limiting us
+        loop = asyncio.get_running_loop()
+        async with throttled():
+            links = await loop.run_in_executor(
+                None, lambda: list(search(query, num_results=num_results))
+            )
 
-        return links
+        _SEARCH_CACHE[cache_key] = links
+        # Hand out a copy so callers cannot mutate the cached list
+        return list(links)
@@ -0,0 +1,82 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import aiohttp
+
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Process-wide HTTP session shared by tools that fetch external pages.
+# Building a ClientSession per request pays connector and DNS-resolver
+# setup plus a TCP/TLS handshake every time; one pooled session keeps
+# connections warm across calls.
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """Return the shared ClientSession, creating it on first use.
+
+    The connector is bounded so one misbehaving tool cannot exhaust file
+    descriptors, and resolved DNS entries are cached for five minutes.
+    """
+    global _session
+    if _session is None or _session.closed:
+        kwargs = {}
+        if orjson is not None:
+            # C-based encoder for json= payloads on this session
+            kwargs["json_serialize"] = lambda obj: orjson.dumps(obj).decode()
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100, limit_per_host=64, ttl_dns_cache=300, keepalive_timeout=75
+            ),
+            **kwargs,
+        )
+    return _session
+
+
+# Caps on outbound HTTP: without them a burst of concurrent fetches
+# storms the connector and DNS resolver until requests start failing.
+# The semaphore bounds in-flight requests; the limiter (when aiolimiter
+# is installed) additionally shapes the sustained request rate.
+HTTP_SEM = asyncio.Semaphore(int(os.environ.get("HTTP_MAX_CONCURRENCY", 16)))
+HTTP_RATE = (
+    AsyncLimiter(float(os.environ.get("HTTP_MAX_RPS", 20)), 1)
+    if AsyncLimiter is not None
+    else None
+)
+
+
+@asynccontextmanager
+async def throttled():
+    """Guard an outbound request with the global concurrency/rate caps.
+
+    Usage::
+
+        async with throttled():
+            async with session.get(url) as resp:
+                ...
+    """
+    async with HTTP_SEM:
+        if HTTP_RATE is not None:
+            async with HTTP_RATE:
+                yield
+        else:
+            yield
+
+
+async def close_shared_session() -> None:
+    """Close the shared session, e.g. at application shutdown"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -1,3 +1,4 @@
+import asyncio
 from collections import defaultdict
 from pathlib import Path
 from typing import Literal, get_args
@@ -102,12 +103,14 @@ class StrReplaceEditor(BaseTool):
     ) -> str:
         _path = Path(path)
         self.validate_path(command, _path)
+        # The command handlers do synchronous disk I/O; run them on a
+        # worker thread so a slow disk never stalls the event loop
         if command == "view":
             result = await self.view(_path, view_range)
         elif command == "create":
             if file_text is None:
                 raise ToolError("Parameter `file_text` is required for command: create")
-            self.write_file(_path, file_text)
+            await asyncio.to_thread(self.write_file, _path, file_text)
             self._file_history[_path].append(file_text)
             result = ToolResult(output=f"File created successfully at: {_path}")
         elif command == "str_replace":
@@ -115,7 +118,7 @@ class StrReplaceEditor(BaseTool):
                 raise ToolError(
                     "Parameter `old_str` is required for command: str_replace"
                 )
-            result = self.str_replace(_path, old_str, new_str)
+            result = await asyncio.to_thread(self.str_replace, _path, old_str, new_str)
         elif command == "insert":
             if insert_line is None:
                 raise ToolError(
@@ -123,9 +126,9 @@ class StrReplaceEditor(BaseTool):
                 )
             if new_str is None:
                 raise ToolError("Parameter `new_str` is required for command: insert")
-            result = self.insert(_path, insert_line, new_str)
+            result = await asyncio.to_thread(self.insert, _path, insert_line, new_str)
         elif command == "undo_edit":
-            result = self.undo_edit(_path)
+            result = await asyncio.to_thread(self.undo_edit, _path)
         else:
             raise ToolError(
                 f'Unrecognized command {command}. The allowed commands for the {self.name} tool are: {", ".join(get_args(Command))}'
@@ -173,7 +176,7 @@ class StrReplaceEditor(BaseTool):
                 stdout = f"Here's the files and directories up to 2 levels deep in {path}, excluding hidden items:\n{stdout}\n"
             return CLIResult(output=stdout, error=stderr)
 
-        file_content = self.read_file(path)
+        file_content = await asyncio.to_thread(self.read_file, path)
         init_line = 1
         if view_range:
             if len(view_range) != 2 or not all(isinstance(i, int) for i in view_range):
@@ -11,12 +11,17 @@ class ToolCollection:
     def __init__(self, *tools: BaseTool):
         self.tools = tools
         self.tool_map = {tool.name: tool for tool in tools}
+        self._params_cache = None
 
     def __iter__(self):
         return iter(self.tools)
 
     def to_params(self) -> List[Dict[str, Any]]:
-        return [tool.to_param() for tool in self.tools]
+        # Rebuilt only when the collection changes; each tool's schema is
+        # itself memoized in BaseTool.to_param
+        if self._params_cache is None:
+            self._params_cache = [tool.to_param() for tool in self.tools]
+        return self._params_cache
 
     async def execute(
         self, *, name: str, tool_input: Dict[str, Any] = None
@@ -47,6 +52,7 @@ class ToolCollection:
     def add_tool(self, tool: BaseTool):
         self.tools += (tool,)
         self.tool_map[tool.name] = tool
+        self._params_cache = None
         return self
 
     def add_tools(self, *tools: BaseTool):
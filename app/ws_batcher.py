@@ -0,0 +1,186 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, Dict, Optional
+
+from app.logger import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data) -> Any:
+    """Parse inbound JSON with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Prebuilt envelopes for the two-key {"type": ..., "content": ...} events
+# that make up nearly all streamed traffic; only the content is encoded
+# per event, the envelope bytes are reused
+_TYPED_PREFIXES = {
+    event_type: ('{"type":"' + event_type + '","content":').encode()
+    for event_type in ("thinking", "progress", "status", "system", "user")
+}
+
+
+def encode_event(event: Any) -> bytes:
+    """Serialize one event to JSON bytes.
+
+    Uses orjson when available (a C-extension encoder several times
+    faster than stdlib json, which matters for HTML-bearing payloads)
+    and splices hot two-key events into a prebuilt envelope so the type
+    key is never re-encoded.
+    """
+    # Exact-type check: every producer hands us plain dicts, and
+    # type(x) is dict skips the ABC machinery isinstance would walk
+    if type(event) is dict and len(event) == 2 and "content" in event:
+        prefix = _TYPED_PREFIXES.get(event.get("type"))
+        if prefix is not None:
+            if orjson is not None:
+                return prefix + orjson.dumps(event["content"]) + b"}"
+            return prefix + json.dumps(event["content"]).encode() + b"}"
+    if orjson is not None:
+        return orjson.dumps(event)
+    return json.dumps(event).encode()
+
+
+async def send_event(websocket, event: Any) -> None:
+    """Send one JSON payload, pre-serialized via encode_event"""
+    await websocket.send_bytes(encode_event(event))
+
+
+def tune_write_buffer(websocket, high: int = 1024 * 1024, low: int = 128 * 1024) -> None:
+    """Best-effort raise of the socket write-buffer high-water mark.
+
+    Starlette does not expose the transport directly, so reach through the
+    ASGI protocol object when possible. A 1 MiB buffer absorbs bursty agent
+    output instead of forcing a drain after every small frame; if the
+    transport cannot be found this is a no-op.
+    """
+    try:
+        protocol = getattr(getattr(websocket, "_send", None), "__self__", None)
+        transport = getattr(protocol, "transport", None)
+        if transport is not None:
+            transport.set_write_buffer_limits(high=high, low=low)
+            logger.debug("WebSocket write buffer limits set to high=%d low=%d", high, low)
+    except Exception:
+        logger.debug("Could not adjust WebSocket write buffer limits", exc_info=True)
+
+
+async def broadcast_event(connections, event: Any) -> None:
+    """Broadcast one event to many connections, serializing it only once.
+
+    Encoding cost stays O(size) rather than O(clients * size): the shared
+    bytes buffer is handed to every socket write. Per-connection results
+    (None or the raised exception) are returned in order so callers can
+    prune dead sockets.
+    """
+    if not connections:
+        return []
+    payload = encode_event(event)
+    return await asyncio.gather(
+        *(ws.send_bytes(payload) for ws in connections),
+        return_exceptions=True,
+    )
+
+
+# Event types that may be dropped latest-value-wins when a slow client
+# fills the buffer; result/error events are never discarded
+_COALESCE_TYPES = {"thinking", "progress", "browser_event"}
+
+
+class WSBatcher:
+    """Coalesce outgoing WebSocket events into batched sends.
+
+    Events are buffered instead of being written to the socket one by one.
+    A background task drains the buffer and flushes everything accumulated
+    within a short window as a single send, cutting the number of socket
+    writes/TLS records during bursty thinking/progress streams.
+
+    The buffer is bounded: when a slow client falls behind, transient
+    event types are collapsed latest-value-wins instead of growing the
+    queue without limit.
+    """
+
+    def __init__(
+        self,
+        websocket,
+        flush_interval: float = 0.03,
+        max_batch: int = 128,
+        max_buffered: int = 256,
+    ):
+        self.websocket = websocket
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch  # Cap batch size to avoid oversize frames
+        self.max_buffered = max_buffered
+        self._buffer: deque = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> "WSBatcher":
+        """Start the background flush task"""
+        if self._task is None:
+            self._task = asyncio.get_event_loop().create_task(self._flush_loop())
+        return self
+
+    async def enqueue(self, event: Dict[str, Any]) -> None:
+        """Buffer an event for the next batched flush"""
+        if len(self._buffer) >= self.max_buffered:
+            event_type = event.get("type") if type(event) is dict else None
+            if event_type in _COALESCE_TYPES:
+                # Latest value wins: replace the oldest event of this type,
+                # or drop the incoming one if none is buffered
+                for i, old in enumerate(self._buffer):
+                    if type(old) is dict and old.get("type") == event_type:
+                        del self._buffer[i]
+                        break
+                else:
+                    self._ready.set()
+                    return
+            # result/error events are kept even if the buffer overshoots
+        self._buffer.append(event)
+        self._ready.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                # Block until there is something to send, then wait briefly
+                # so events emitted in a burst coalesce into one frame
+                await self._ready.wait()
+                await asyncio.sleep(self.flush_interval)
+
+                events = []
+                while self._buffer and len(events) < self.max_batch:
+                    events.append(self._buffer.popleft())
+                if not self._buffer:
+                    self._ready.clear()
+                if not events:
+                    continue
+
+                if len(events) == 1:
+                    await send_event(self.websocket, events[0])
+                else:
+                    await send_event(self.websocket, {"type": "batch", "events": events})
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error flushing WebSocket batch: {e}")
+
+    async def close(self) -> None:
+        """Stop the flush task and send any events still buffered"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        events = list(self._buffer)
+        self._buffer.clear()
+        self._ready.clear()
+        if events:
+            try:
+                await send_event(self.websocket, {"type": "batch", "events": events})
+            except Exception as e:
+                logger.error(f"Error flushing final WebSocket batch: {e}")
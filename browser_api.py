@@ -0,0 +1,737 @@
+import asyncio
+import mimetypes
+import os
+from functools import lru_cache
+from pathlib import Path
+from uuid import uuid4
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import json
+
+import aiofiles
+import uvicorn
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from email.utils import formatdate
+
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from playwright.async_api import async_playwright
+from pydantic import BaseModel
+
+from app.logger import setup_logger
+
+logger = setup_logger("browser_api")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Root the file endpoints may serve from, resolved once at import: each
+# request then needs a single realpath + string compare instead of the
+# abspath/exists/access syscall trio, and paths escaping the root (e.g.
+# ../../etc/passwd) are rejected with a 403
+ALLOWED_ROOT = Path(os.environ.get("BROWSER_API_ROOT", BASE_DIR)).resolve()
+
+# Files at or above this size are streamed instead of being inlined into
+# a JSON envelope; inlining costs several full copies of the content
+# (str + JSON-escaped + socket buffer) and delays the first byte until
+# the whole file is read
+INLINE_CONTENT_LIMIT = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Browser state shared by the endpoints. These globals are per-process,
+# which is why the server runs a single uvicorn worker (see __main__):
+# with several workers each would own a different browser and state.
+playwright_instance = None
+browser_instance = None
+page_instance = None
+# __slots__ keeps field access a fixed-offset load instead of a dict
+# probe on every read/write, and misspelled fields fail loudly instead
+# of silently adding keys
+@dataclass(slots=True)
+class BrowserState:
+    currentUrl: str = ""
+    pageTitle: str = ""
+    pageContent: str = ""
+    error: Optional[str] = None
+
+
+browser_state = BrowserState()
+
+# Pre-serialized responses for the polling endpoints: the UI hits /state
+# and /current-url several times a second, and pageContent can be
+# hundreds of KB - re-encoding an unchanged dict per poll is pure CPU
+# burn, so the JSON bytes are rebuilt only when a writer dirties them
+_state_bytes: bytes = b""
+_state_dirty: bool = True
+_url_cache: tuple = (None, b"")
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+# Page title/content are captured lazily: serializing the live DOM over
+# CDP is the single biggest per-action cost, and most actions are never
+# followed by a state read. Actions only flag the content stale; the
+# first /state read after that pays for the capture.
+_content_dirty: bool = True
+
+# Raw CDP sessions, one per pooled page, opened lazily and kept for the
+# page's lifetime. Issuing Runtime.evaluate directly skips Playwright's
+# accessor layer (one Python wrapper hop per call) on the hot
+# capture-state-after-action path.
+_cdp_sessions: dict = {}
+
+
+async def _cdp_for(page):
+    session = _cdp_sessions.get(page)
+    if session is None:
+        session = await page.context.new_cdp_session(page)
+        _cdp_sessions[page] = session
+    return session
+
+# Single lock serializing every browser_state write and the Playwright
+# action that produces it: without it, overlapping background actions
+# interleave and /state can observe one page's URL with another's
+# content
+state_lock = asyncio.Lock()
+
+
+def _mark_state_dirty() -> None:
+    global _state_dirty
+    _state_dirty = True
+
+
+def _mark_content_dirty() -> None:
+    global _content_dirty
+    _content_dirty = True
+    _mark_state_dirty()
+
+
+async def _ensure_content() -> None:
+    """Capture title and content from the page if an action staled them"""
+    global _content_dirty
+    if not _content_dirty or page_instance is None:
+        return
+    async with state_lock:
+        if not _content_dirty:
+            return
+        try:
+            # One gathered batch pipelines both evaluations onto the CDP
+            # socket as raw protocol messages
+            cdp = await _cdp_for(page_instance)
+            title_res, html_res = await asyncio.gather(
+                cdp.send(
+                    "Runtime.evaluate",
+                    {"expression": "document.title", "returnByValue": True},
+                ),
+                cdp.send(
+                    "Runtime.evaluate",
+                    {
+                        "expression": "document.documentElement.outerHTML",
+                        "returnByValue": True,
+                    },
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Content capture failed: {e}")
+            browser_state.error = str(e)
+            _mark_state_dirty()
+            return
+        browser_state.pageTitle = title_res["result"].get("value", "")
+        browser_state.pageContent = html_res["result"].get("value", "")
+        _content_dirty = False
+        _mark_state_dirty()
+
+
+def _state_payload() -> bytes:
+    global _state_bytes, _state_dirty
+    if _state_dirty:
+        _state_bytes = _dumps(asdict(browser_state))
+        _state_dirty = False
+    return _state_bytes
+
+
+def _url_payload() -> bytes:
+    global _url_cache
+    url = browser_state.currentUrl
+    if _url_cache[0] != url:
+        _url_cache = (url, _dumps({"url": url}))
+    return _url_cache[1]
+
+
+# Browser actions are funneled through one queue with a single consumer:
+# FIFO execution against the shared page with no per-request task spawn,
+# instead of BackgroundTasks racing each other on page_instance
+action_queue: asyncio.Queue = None
+_worker_task: asyncio.Task = None
+
+
+async def _action_worker() -> None:
+    global page_instance
+    while True:
+        handler, args, future = await action_queue.get()
+        try:
+            if handler in _PAGE_HANDLERS:
+                page = await page_pool.acquire()
+                try:
+                    result = await handler(page, *args)
+                    # State reads follow whichever page acted last
+                    page_instance = page
+                finally:
+                    page_pool.release(page)
+            else:
+                result = await handler(*args)
+            if future is not None and not future.done():
+                future.set_result(result)
+        except Exception as e:
+            logger.error(f"Action failed in worker: {e}")
+            if future is not None and not future.done():
+                future.set_exception(e)
+        finally:
+            action_queue.task_done()
+
+
+async def _enqueue_action(handler, *args) -> "asyncio.Future":
+    """Queue an action; the returned future resolves when it has run"""
+    future = asyncio.get_running_loop().create_future()
+    await action_queue.put((handler, args, future))
+    return future
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global action_queue, _worker_task
+    action_queue = asyncio.Queue()
+    _worker_task = asyncio.create_task(_action_worker())
+    # Launch the browser eagerly so the first action request does not
+    # pay the multi-second Chromium startup
+    await action_queue.put((initialize_browser, (), None))
+    yield
+    _worker_task.cancel()
+    # Per-worker shutdown: close this worker's browser, if it was launched
+    global playwright_instance, browser_instance, page_instance
+    if browser_instance:
+        await browser_instance.close()
+        browser_instance = None
+        page_instance = None
+    if playwright_instance:
+        await playwright_instance.stop()
+        playwright_instance = None
+
+
+# Serialize every dict-returning endpoint through orjson when available;
+# the hottest endpoints (/state, /current-url) bypass even that with
+# pre-encoded byte buffers
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse
+
+    _default_response_class = ORJSONResponse
+else:
+    _default_response_class = JSONResponse
+
+app = FastAPI(
+    title="OpenManus Browser API",
+    lifespan=lifespan,
+    default_response_class=_default_response_class,
+)
+
+# pageContent responses are routinely 100KB+ of HTML, which gzips 5-10x;
+# level 5 keeps the CPU cost well under the bytes it saves on the wire.
+# Small payloads (the polling endpoints) stay uncompressed via
+# minimum_size.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Added last so CORS sits outermost: preflights get their 204 straight
+# from the middleware without traversing gzip or the router. OPTIONS in
+# allow_methods lets it short-circuit, and max_age lets browsers cache
+# the preflight for a day instead of re-asking before every call.
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "If-None-Match", "If-Modified-Since", "Range"],
+    max_age=86400,
+)
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with a Cache-Control policy on successful responses.
+
+    Starlette already serves these through sendfile where the platform
+    supports it; the added header lets the browser skip re-requests for
+    an hour on top of the built-in ETag/304 handling.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers.setdefault("Cache-Control", "public, max-age=3600")
+        return response
+
+
+# Serve project files directly for the frontend's browser view
+app.mount("/files", CachedStaticFiles(directory=BASE_DIR), name="files")
+
+
+class BrowserAction(BaseModel):
+    action: str
+    url: Optional[str] = None
+    selector: Optional[str] = None
+    text: Optional[str] = None
+
+
+class UrlUpdate(BaseModel):
+    url: str
+
+
+class FileRequest(BaseModel):
+    file_path: str
+
+
+# Load the MIME DB once at import and register the .js mapping some
+# platforms report as text/plain, so no per-request special case remains
+mimetypes.init()
+mimetypes.add_type("application/javascript", ".js")
+
+
+@lru_cache(maxsize=256)
+def _ext_mime_type(ext: str) -> str:
+    mime_type, _ = mimetypes.guess_type("x" + ext)
+    return mime_type or "text/plain"
+
+
+def get_file_mime_type(path: str) -> str:
+    """Guess the MIME type for a file path, cached per extension"""
+    return _ext_mime_type(os.path.splitext(path)[1].lower())
+
+
+class PagePool:
+    """Lazily grown pool of pages over the shared browser.
+
+    Pages are created on demand up to max_pages and recycled through a
+    queue. Sequential actions keep landing on the same page (it is
+    released before the next acquire), preserving stateful
+    navigate-then-click flows, while bursts get extra pages instead of
+    serializing on one global.
+    """
+
+    def __init__(self, browser, max_pages: int):
+        self.browser = browser
+        self.max_pages = max_pages
+        self._created = 0
+        self._free: asyncio.Queue = asyncio.Queue()
+        self._grow_lock = asyncio.Lock()
+
+    async def acquire(self):
+        try:
+            return self._free.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        async with self._grow_lock:
+            if self._created < self.max_pages:
+                self._created += 1
+                return await self.browser.new_page()
+        return await self._free.get()
+
+    def release(self, page) -> None:
+        self._free.put_nowait(page)
+
+
+page_pool: PagePool = None
+
+# A burst of first requests must not launch N browsers: the lock makes
+# initialization single-flight and the event lets waiters block until
+# the one launch completes
+_browser_ready = asyncio.Event()
+_browser_init_lock = asyncio.Lock()
+
+
+async def initialize_browser() -> None:
+    """Launch the Playwright browser for this worker (idempotent)"""
+    global playwright_instance, browser_instance, page_instance, page_pool
+    async with _browser_init_lock:
+        if browser_instance:
+            _browser_ready.set()
+            return
+        logger.info("Initializing browser...")
+        playwright_instance = await async_playwright().start()
+        browser_instance = await playwright_instance.chromium.launch(headless=True)
+        page_pool = PagePool(
+            browser_instance, int(os.environ.get("BROWSER_API_MAX_PAGES", 4))
+        )
+        page_instance = await page_pool.acquire()
+        # Open the raw CDP session now so the first state read does not
+        # pay for session setup
+        await _cdp_for(page_instance)
+        page_pool.release(page_instance)
+        browser_state.error = None
+        _mark_state_dirty()
+        _browser_ready.set()
+        logger.info("Browser initialized")
+
+
+async def navigate_to(page, url: str) -> None:
+    """Navigate a pooled page and refresh the browser state"""
+    async with state_lock:
+        try:
+            await page.goto(url)
+            browser_state.currentUrl = page.url
+            browser_state.error = None
+        except Exception as e:
+            logger.error(f"Navigation failed: {e}")
+            browser_state.error = str(e)
+        _mark_content_dirty()
+
+
+async def click_element(page, selector: str) -> None:
+    """Click an element and refresh the browser state"""
+    async with state_lock:
+        try:
+            await page.click(selector)
+            browser_state.currentUrl = page.url
+            browser_state.error = None
+        except Exception as e:
+            logger.error(f"Click failed: {e}")
+            browser_state.error = str(e)
+        _mark_content_dirty()
+
+
+async def type_text(page, selector: str, text: str) -> None:
+    """Type into an element and refresh the browser state"""
+    async with state_lock:
+        try:
+            await page.type(selector, text)
+            browser_state.currentUrl = page.url
+            browser_state.error = None
+        except Exception as e:
+            logger.error(f"Type failed: {e}")
+            browser_state.error = str(e)
+        _mark_content_dirty()
+
+
+# Handlers that operate on a page borrowed from the pool; the queue
+# worker acquires/releases around the call
+_PAGE_HANDLERS = {navigate_to, click_element, type_text}
+
+# Actions that outlive their request, keyed by job id for /job polling.
+# Bounded: finished-but-unpolled entries are shed once the map grows.
+_jobs: dict = {}
+_JOBS_LIMIT = 256
+
+# Dispatch table: action name -> (handler, required fields, status label).
+# One dict probe replaces the if/elif chain and keeps the argument
+# requirements declared next to the handler they belong to.
+_ACTIONS = {
+    "navigate": (navigate_to, ("url",), "navigating"),
+    "click": (click_element, ("selector",), "clicking"),
+    "type": (type_text, ("selector", "text"), "typing"),
+}
+
+
+@app.post("/api/browser/action")
+async def perform_action(action: BrowserAction):
+    """Dispatch a browser action requested by the frontend or agent"""
+    entry = _ACTIONS.get(action.action)
+    if entry is None:
+        raise HTTPException(status_code=400, detail=f"Unknown action: {action.action}")
+    handler, required, status = entry
+
+    missing = [name for name in required if not getattr(action, name)]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{', '.join(missing)} required for {action.action}",
+        )
+
+    if not browser_instance:
+        # Initialization is single-flight; wait for it rather than
+        # answering "initializing" and forcing the client to retry
+        await _enqueue_action(initialize_browser)
+        try:
+            await asyncio.wait_for(_browser_ready.wait(), timeout=30)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=503, detail="Browser failed to initialize in time"
+            )
+
+    future = await _enqueue_action(handler, *(getattr(action, name) for name in required))
+
+    # Fast actions finish inside the request: return the fresh state in
+    # the same response so the client skips the poll-until-updated dance.
+    # Slow ones get a job id to poll instead of an ambiguous "clicking".
+    done, _ = await asyncio.wait({future}, timeout=0.5)
+    if done:
+        future.result()  # surface worker-side exceptions
+        await _ensure_content()
+        async with state_lock:
+            return {"status": "success", **asdict(browser_state)}
+
+    job_id = uuid4().hex
+    _jobs[job_id] = future
+    if len(_jobs) > _JOBS_LIMIT:
+        # Clients that never poll would leak entries; shed finished ones
+        for key in [k for k, f in _jobs.items() if f.done()]:
+            del _jobs[key]
+    return {"status": status, "jobId": job_id}
+
+
+@app.get("/api/browser/job/{job_id}")
+async def get_job(job_id: str):
+    """Poll a slow action started by /action"""
+    future = _jobs.get(job_id)
+    if future is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if not future.done():
+        return {"status": "running", "jobId": job_id}
+    del _jobs[job_id]
+    future.result()
+    await _ensure_content()
+    async with state_lock:
+        return {"status": "success", **asdict(browser_state)}
+
+
+def _resolve_local_path(file_path: str) -> str:
+    """Resolve a requested path and confine it to ALLOWED_ROOT"""
+    p = Path(file_path) if os.path.isabs(file_path) else ALLOWED_ROOT / file_path
+    resolved = p.resolve()
+    if not resolved.is_relative_to(ALLOWED_ROOT):
+        raise HTTPException(
+            status_code=403, detail=f"Path outside allowed root: {file_path}"
+        )
+    return str(resolved)
+
+
+# LRU over decoded small-file contents, keyed by (path, mtime_ns, size)
+# so edits invalidate naturally via the stat already done per request.
+# A repeat open of the same file becomes a pure RAM serve - no open(),
+# no read, no decode.
+_file_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_file_cache_bytes = 0
+FILE_CACHE_LIMIT = 64 * 1024 * 1024
+
+
+def _file_cache_get(key: tuple) -> Optional[str]:
+    content = _file_cache.get(key)
+    if content is not None:
+        _file_cache.move_to_end(key)
+    return content
+
+
+def _file_cache_put(key: tuple, content: str) -> None:
+    global _file_cache_bytes
+    if key in _file_cache:
+        return
+    _file_cache[key] = content
+    _file_cache_bytes += len(content)
+    while _file_cache_bytes > FILE_CACHE_LIMIT and _file_cache:
+        _, evicted = _file_cache.popitem(last=False)
+        _file_cache_bytes -= len(evicted)
+
+
+def _cache_headers(st: os.stat_result) -> dict:
+    """Validator headers derived from one stat: strong ETag + Last-Modified"""
+    return {
+        "ETag": f'"{st.st_size:x}-{st.st_mtime_ns:x}"',
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": "public, max-age=60",
+    }
+
+
+@app.post("/api/browser/open-local-file")
+async def open_local_file(request: FileRequest, http_request: Request):
+    """Serve a local file's content for the browser view"""
+    file_path = request.file_path
+    abs_path = _resolve_local_path(file_path)
+
+    # One stat covers existence, readability, size and mtime; keep it off
+    # the event loop since NFS or a cold cache can make it slow
+    try:
+        st = await asyncio.to_thread(os.stat, abs_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+
+    # Conditional requests: the UI polls the same files, so a matching
+    # validator skips the read, the serialization and the body bytes
+    headers = _cache_headers(st)
+    if http_request.headers.get("if-none-match") == headers["ETag"] or (
+        "if-none-match" not in http_request.headers
+        and http_request.headers.get("if-modified-since") == headers["Last-Modified"]
+    ):
+        return Response(status_code=304, headers=headers)
+
+    # Inline small text files into the JSON envelope the frontend expects;
+    # anything large streams from disk with O(chunk) memory instead of
+    # holding several copies of the whole file
+    mime_type = get_file_mime_type(abs_path)
+    if st.st_size >= INLINE_CONTENT_LIMIT:
+        return FileResponse(
+            abs_path,
+            media_type=mime_type,
+            filename=os.path.basename(abs_path),
+            headers=headers,
+        )
+
+    cache_key = (abs_path, st.st_mtime_ns, st.st_size)
+    content = _file_cache_get(cache_key)
+    if content is None:
+        try:
+            async with aiofiles.open(abs_path, "r", encoding="utf-8") as f:
+                content = await f.read()
+        except (UnicodeDecodeError, ValueError):
+            # Small binary files (images etc.) cannot ride in the JSON
+            # envelope; hand them off byte-for-byte instead of 500ing
+            return FileResponse(
+                abs_path,
+                media_type=mime_type,
+                filename=os.path.basename(abs_path),
+                headers=headers,
+            )
+        _file_cache_put(cache_key, content)
+
+    rel_path = os.path.relpath(abs_path, BASE_DIR)
+    return _default_response_class(
+        {
+            "url": f"http://localhost:8001/files/{rel_path}",
+            "content": content,
+            "mime_type": mime_type,
+        },
+        headers=headers,
+    )
+
+
+async def _file_chunks(path: str, start: int, end: int):
+    """Yield file bytes in STREAM_CHUNK_SIZE pieces for [start, end]"""
+    remaining = end - start + 1
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        while remaining > 0:
+            chunk = await f.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@app.get("/api/browser/file")
+async def get_file(file_path: str):
+    """Zero-copy delivery of a local file.
+
+    FileResponse lets Starlette use sendfile where available, moving
+    bytes kernel-to-socket without the read/encode/write copies the JSON
+    envelope pays.
+    """
+    abs_path = _resolve_local_path(file_path)
+    try:
+        st = await asyncio.to_thread(os.stat, abs_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+    return FileResponse(
+        abs_path,
+        media_type=get_file_mime_type(abs_path),
+        stat_result=st,
+        headers=_cache_headers(st),
+    )
+
+
+@app.post("/api/browser/open-local-file/stream")
+async def open_local_file_stream(request: FileRequest, http_request: Request):
+    """Stream a local file with chunked transfer and Range support"""
+    file_path = request.file_path
+    abs_path = _resolve_local_path(file_path)
+
+    try:
+        st = await asyncio.to_thread(os.stat, abs_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+
+    start, end = 0, st.st_size - 1
+    status_code = 200
+    headers = {"Accept-Ranges": "bytes"}
+    range_header = http_request.headers.get("range")
+    if range_header and range_header.startswith("bytes="):
+        try:
+            range_start, _, range_end = range_header[6:].partition("-")
+            if not range_start:
+                # Suffix range (bytes=-N): the last N bytes of the file
+                suffix = int(range_end)
+                if suffix <= 0:
+                    raise HTTPException(
+                        status_code=416, detail="Range not satisfiable"
+                    )
+                start = max(0, st.st_size - suffix)
+                end = st.st_size - 1
+            else:
+                start = int(range_start)
+                end = int(range_end) if range_end else st.st_size - 1
+        except ValueError:
+            raise HTTPException(status_code=416, detail="Invalid Range header")
+        if start > end or end >= st.st_size:
+            raise HTTPException(status_code=416, detail="Range not satisfiable")
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        _file_chunks(abs_path, start, end),
+        status_code=status_code,
+        media_type=get_file_mime_type(abs_path),
+        headers=headers,
+    )
+
+
+@app.post("/api/browser/update-url")
+async def update_url(update: UrlUpdate):
+    """Record a URL change reported by the agent's browser tool"""
+    async with state_lock:
+        browser_state.currentUrl = update.url
+        _mark_state_dirty()
+    return {"status": "ok"}
+
+
+@app.get("/api/browser/current-url")
+async def get_current_url():
+    """Current URL for the frontend's polling browser view"""
+    async with state_lock:
+        payload = _url_payload()
+    return Response(content=payload, media_type="application/json")
+
+
+@app.get("/api/browser/state")
+async def get_browser_state():
+    """Full browser state snapshot"""
+    await _ensure_content()
+    # Snapshot under the lock so the cached bytes never mix two writes
+    async with state_lock:
+        payload = _state_payload()
+    return Response(content=payload, media_type="application/json")
+
+
+if __name__ == "__main__":
+    # uvloop replaces the default event loop with libuv bindings and
+    # httptools swaps the Python HTTP parser for llhttp; both cut
+    # per-request overhead for every endpoint in this module
+    uvicorn.run(
+        "browser_api:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        # Single worker: browser_state, the action queue, job futures and
+        # the page pool are all process-local, so extra workers would give
+        # each client a different browser and 404 cross-worker job polls
+        workers=1,
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )
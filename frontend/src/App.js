@@ -85,7 +85,10 @@ function App() {
     }
 
     const ws = new WebSocket(WS_URL);
-    
+    // Server sends binary (pre-serialized JSON bytes); arraybuffer avoids
+    // the async Blob read before parsing
+    ws.binaryType = 'arraybuffer';
+
     ws.onopen = () => {
       setIsConnected(true);
       setMessages(prev => [...prev, {
@@ -97,22 +100,35 @@ function App() {
 
     ws.onmessage = (event) => {
       try {
-        const data = JSON.parse(event.data);
+        const text = typeof event.data === 'string'
+          ? event.data
+          : new TextDecoder().decode(event.data);
+        const data = JSON.parse(text);
         console.group('WebSocket Message Received');
         console.log('Raw data:', data);
-        
-        switch (data.type) {
-          case 'browser_event':
-            console.log('Browser event received:', data);
-            setBrowserData(data);
-            setShowBrowser(true);
-            break;
-          default:
-            console.log('Message event:', data);
-            setMessages(prev => [...prev, data]);
-            setIsLoading(data.type !== 'result');
+
+        const handleEvent = (event) => {
+          switch (event.type) {
+            case 'browser_event':
+              console.log('Browser event received:', event);
+              setBrowserData(event);
+              setShowBrowser(true);
+              break;
+            default:
+              console.log('Message event:', event);
+              setMessages(prev => [...prev, event]);
+              setIsLoading(event.type !== 'result');
+          }
+        };
+
+        // Coalesced frames from the server-side batcher carry several
+        // events in one payload
+        if (data.type === 'batch') {
+          data.events.forEach(handleEvent);
+        } else {
+          handleEvent(data);
         }
-        
+
         console.groupEnd();
       } catch (error) {
         console.error('Error handling websocket message:', error);
@@ -13,6 +13,8 @@ class WebSocketService {
 
   connect() {
     this.ws = new WebSocket(this.url);
+    // Server sends binary frames; arraybuffer avoids the async Blob read
+    this.ws.binaryType = 'arraybuffer';
 
     this.ws.onopen = () => {
       console.log('WebSocket connected');
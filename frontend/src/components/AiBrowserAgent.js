@@ -33,7 +33,10 @@ const AiBrowserAgent = () => {
     const connectWebSocket = () => {
       try {
         wsRef.current = new WebSocket('ws://localhost:8000/ws');
-        
+        // Server sends binary (pre-serialized JSON bytes); arraybuffer
+        // avoids the async Blob read before parsing
+        wsRef.current.binaryType = 'arraybuffer';
+
         wsRef.current.onopen = () => {
           console.log('Connected to WebSocket server');
           setIsConnected(true);
@@ -52,11 +55,7 @@ const AiBrowserAgent = () => {
           console.error('WebSocket error:', error);
         };
         
-        wsRef.current.onmessage = (event) => {
-          try {
-            const data = JSON.parse(event.data);
-            console.log('WebSocket message received:', data);
-            
+        const handleEvent = (data) => {
             if (data.type === 'browser_event') {
               // Handle browser events
               if (data.content?.url) {
@@ -91,6 +90,20 @@ const AiBrowserAgent = () => {
                 content: data.content
               }]);
             }
+        };
+
+        wsRef.current.onmessage = (event) => {
+          try {
+            const text = typeof event.data === 'string'
+              ? event.data
+              : new TextDecoder().decode(event.data);
+            const parsed = JSON.parse(text);
+            console.log('WebSocket message received:', parsed);
+
+            // Coalesced frames from the server-side batcher carry several
+            // events in one payload
+            const events = parsed.type === 'batch' ? parsed.events : [parsed];
+            events.forEach(handleEvent);
           } catch (error) {
             console.error('Error processing message:', error);
             setIsThinking(false);